@@ -57,14 +57,16 @@ substrate_id = LocationId('substrate')
 stop_id = LocationId('stop')
 
 # load solutions
-oss.load(exp_id, capture_antibody_vol*num_samples, capture_antibody, capture_id)
-oss.load(exp_id, wash_buffer_vol*num_samples*5*3, wash_buffer, wash_id)
-oss.load(exp_id, blocking_buffer_vol*num_samples, blocking_buffer, blocking_id)
-oss.load(exp_id, detection_antibody_vol*num_samples, detection_antibody, detection_id)
-oss.load(exp_id, sample_vol*num_samples, sample, sample_id)
-oss.load(exp_id, conjugate_vol*num_samples, conjugate, conjugate_id)    
-oss.load(exp_id, substrate_vol*num_samples, substrate, substrate_id)    
-oss.load(exp_id, stop_solution_vol*num_samples, stop_solution, stop_id)
+oss.load_many(exp_id, [
+    (capture_antibody_vol*num_samples, capture_antibody, capture_id),
+    (wash_buffer_vol*num_samples*5*3, wash_buffer, wash_id),
+    (blocking_buffer_vol*num_samples, blocking_buffer, blocking_id),
+    (detection_antibody_vol*num_samples, detection_antibody, detection_id),
+    (sample_vol*num_samples, sample, sample_id),
+    (conjugate_vol*num_samples, conjugate, conjugate_id),
+    (substrate_vol*num_samples, substrate, substrate_id),
+    (stop_solution_vol*num_samples, stop_solution, stop_id),
+])
 
 # coat plate with capture antibody
 oss.transfer(exp_id, capture_antibody_vol, capture_id, loc_id)
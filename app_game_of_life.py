@@ -28,15 +28,37 @@ for i in range(num_rows):
 live_id = LocationId('live')
 dead_id = LocationId('dead')
 
-# initialize wells grid
-wells = []
-for i in range(num_rows):
-    wells.append([0 for j in range(num_cols)])
-    
-for i in range(num_rows):
-    for j in range(num_cols):
-        if (i,j) in initial_live:
-            wells[i][j] = 1
+# initialize wells grid as a bitboard, bit i*num_cols+j is set if well (i,j) is live
+wells = 0
+for (i, j) in initial_live:
+    wells |= 1 << (i*num_cols+j)
+
+# masks to drop neighbors which wrap around the board edges
+board_mask = (1 << (num_rows*num_cols)) - 1
+first_col = sum(1 << (i*num_cols) for i in range(num_rows))
+not_first_col = board_mask & ~first_col
+not_last_col = board_mask & ~(first_col << (num_cols-1))
+
+# characters used to display dead and live cells
+cell_chars = str.maketrans('01', '.X')
+
+# apply one step of the Game of Life rule to the bitboard wells
+def next_generation(wells):
+    # shift the board once per neighbor direction (W, E, N, S, NW, NE, SW, SE)
+    neighbors = ((wells << 1) & not_first_col, (wells >> 1) & not_last_col,
+                 (wells << num_cols) & board_mask, wells >> num_cols,
+                 (wells << (num_cols+1)) & not_first_col, (wells << (num_cols-1)) & not_last_col,
+                 (wells >> (num_cols-1)) & not_first_col, (wells >> (num_cols+1)) & not_last_col)
+    # add them up bitwise with half adders into a 3 bit count (s4 s2 s1) per cell
+    s1 = s2 = s4 = 0
+    for n in neighbors:
+        carry1 = s1 & n
+        s1 ^= n
+        carry2 = s2 & carry1
+        s2 ^= carry1
+        s4 ^= carry2
+    # live if 3 neighbors, or live with 2 neighbors
+    return s2 & ~s4 & (s1 | wells)
 
 # load live and dead solutions into reservoirs
 oss.load(exp_id, vol*num_rows*num_cols, live_sol, live_id)
@@ -44,54 +66,26 @@ oss.load(exp_id, vol*num_rows*num_cols, dead_sol, dead_id)
 
 # start generations loop
 for gen in range(num_generations):
-    # visualize the grid
-    for i in range(num_rows):
-        for j in range(num_cols):
-            if wells[i][j] == 1:
-                print("X", end=" ")
-            else:
-                print(".", end=" ")
-        print()
-    print()
+    # visualize the grid, bit k of the board is character k of the reversed binary string
+    cells = format(wells, f'0{num_rows*num_cols}b')[::-1].translate(cell_chars)
+    print('\n'.join(' '.join(cells[i*num_cols:(i+1)*num_cols]) for i in range(num_rows)), end='\n\n')
     
     # transfer live solution in live cells and dead solution in dead cells
-    for i in range(num_rows):
-        for j in range(num_cols):
-            if wells[i][j] == 1:
-                oss.transfer(exp_id, vol, live_id, loc_id[i*num_cols+j])
-            else:
-                oss.transfer(exp_id, vol, dead_id, loc_id[i*num_cols+j])
+    for k, id in enumerate(loc_id):
+        if wells >> k & 1:
+            oss.transfer(exp_id, vol, live_id, id)
+        else:
+            oss.transfer(exp_id, vol, dead_id, id)
                     
     # measure absorbance in each cell
     absorbance = oss.measure_absorbance(exp_id, loc_id, (wavelength, wavelength))         
-    for i in range(num_rows):
-        for j in range(num_cols):
-            if absorbance[i*num_cols+j]  > absorbance_threshold:
-                wells[i][j] = 1
-            else:
-                wells[i][j] = 0
+    wells = sum(1 << k for k, value in enumerate(absorbance) if value > absorbance_threshold)
     
     # compute next generation based on neighbors
-    for i in range(num_rows):
-        for j in range(num_cols):
-            live_neighbors = 0
-            for k in range(-1, 2):
-                for l in range(-1, 2):
-                    if k == 0 and l == 0:
-                        continue
-                    if i+k < 0 or i+k >= num_rows or j+l < 0 or j+l >= num_cols:
-                        continue
-                    if wells[i+k][j+l] == 1:
-                        live_neighbors += 1
-            if live_neighbors < 2 or live_neighbors > 3:
-                wells[i][j] = 0
-            elif live_neighbors == 3:
-                wells[i][j] = 1
+    wells = next_generation(wells)
             
     # discard solutions from all wells    
-    for i in range(num_rows):
-        for j in range(num_cols):
-            oss.discard(exp_id, vol, loc_id[i*num_cols+j], release_labware=True)
+    oss.discard(exp_id, vol, loc_id, release_labware=True)
             
 # terminate the experiment
 oss.experiment_end(exp_id)  
@@ -29,13 +29,14 @@ sol2_id = LocationId('sol2')
 oss.load(exp_id, tot_vol*num_mixes, sol1, sol1_id)
 oss.load(exp_id, tot_vol*num_mixes, sol2, sol2_id)
 
+# volumes of the 2 solutions in each mix
+sol1_vol = [tot_vol * (lowest_percent + step_percent * i) // 100 for i in range(num_mixes)]
+sol2_vol = [tot_vol - vol for vol in sol1_vol]
+
 # prepare multiple mixes
-for i in range(num_mixes):
-    sol1_vol = tot_vol * (lowest_percent + step_percent * i) // 100
-    sol2_vol = tot_vol - sol1_vol
-    oss.transfer(exp_id, sol1_vol, sol1_id, loc_id[i])
-    oss.transfer(exp_id, sol2_vol, sol2_id, loc_id[i])
-    oss.mix(exp_id, loc_id[i], tot_vol)
+oss.transfer(exp_id, sol1_vol, sol1_id, loc_id)
+oss.transfer(exp_id, sol2_vol, sol2_id, loc_id)
+oss.mix(exp_id, loc_id, tot_vol)
     
 # analyze each well
 absorbance = oss.measure_absorbance(exp_id, loc_id, (wavelength, wavelength))
@@ -25,8 +25,10 @@ base_id = LocationId('base')
 stock_id = LocationId('stock')
 
 # load base solvent and stock solution 
-oss.load(exp_id, base_vol*num_wells, base, base_id)
-oss.load(exp_id, stock_vol, stock, stock_id)
+oss.load_many(exp_id, [
+    (base_vol*num_wells, base, base_id),
+    (stock_vol, stock, stock_id),
+])
     
 # transfer base solvent to each well
 oss.transfer(exp_id, base_vol, base_id, loc_id)
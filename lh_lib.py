@@ -3,16 +3,16 @@ from oss_utils import Location, logger
 class LiquidHandler:
 
     def attach_tip(self):
-        logger.debug(f'\tLH: attach tip')
+        logger.debug('\tLH: attach tip')
         
     def move_pipette(self, location: Location):
-        logger.debug(f'\tLH: move pipette to {location}')
+        logger.debug('\tLH: move pipette to %s', location)
         
     def aspirate(self, vol:int):
-        logger.debug(f'\tLH: aspirate {vol}ul')
+        logger.debug('\tLH: aspirate %sul', vol)
         
     def dispense(self, vol:int):
-        logger.debug(f'\tLH: dispense {vol}ul')   
+        logger.debug('\tLH: dispense %sul', vol)   
         
     def discard_tip(self):
-        logger.debug(f'\tLH: discard tip')
\ No newline at end of file
+        logger.debug('\tLH: discard tip')
\ No newline at end of file
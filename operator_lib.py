@@ -1,3 +1,4 @@
+import logging
 from  oss_utils import Location, LocationId, Equipment, Labware, logger
 
 # Operator class definition
@@ -6,6 +7,11 @@ class Operator:
     def command(self, command: str):
         logger.debug("\tOP: %s", command)
         
+    def run_protocol(self, commands: list[str]):
+        # send a sequence of commands in one go
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\tOP: %s", "\n\tOP: ".join(commands))
+        
     # def place(self, dest: Location):
     #     logger.debug("OP: place %s", dest) 
         
@@ -1,37 +1,46 @@
+import bisect
 import datetime
+import itertools
+from dataclasses import dataclass, field
+import logging
 import operator_lib
 import lh_lib
-from oss_utils import Location, LocationId, Equipment, Labware, Material
-from oss_utils import LH_MAX_SLOTS, WELLPLATE_MAX_WELLS, WORKBENCH_MAX_SLOTS
-from oss_utils import well_id_int_to_str, well_id_str_to_int, logger
-import time
+from oss_utils import Location, LocationId, Equipment, Labware, Material, make_location
+from oss_utils import LH_MAX_SLOTS, LH_NUM_CHANNELS, TIP_CAPACITY, WORKBENCH_MAX_SLOTS
+from oss_utils import WELLPLATE_MAX_WELLS, WELLPLATE_ROW_SIZE
+from oss_utils import logger, flush_log
+import threading
 
 # ===================================================================
 # Experiment class definition    
 
+_ALL_WELLS_FREE = (1 << WELLPLATE_MAX_WELLS) - 1
+
+# enum members used on hot paths, bound once since looking them up on the enum class is slow;
+# members are singletons, so they are compared with `is`
+_LIQUID_HANDLER = Equipment.liquid_handler
+_WORKBENCH = Equipment.workbench
+_WELLPLATE = Labware.wellplate
+_RESERVOIR = Labware.reservoir
+
+@dataclass(slots=True, eq=False)
 class Experiment:
     """
     @private
     """
-    def __init__(self, exp_id: int, name:str):
-        """
-        Initialize an Experiment object.
-
-        Parameters:
-        exp_id (int): Experiment ID
-        name (str): Experiment name
-
-        Returns:
-        None
-        """
-        
-        logger.info(f"Experiment {exp_id} created")
-        self.exp_id = exp_id
-        self.name = name
-        self.create_time = datetime.datetime.now()
-        self.location_map = {}
-        self.lh_slots_used = []
-        # TODO: add more experiment state here
+    exp_id: int
+    name: str
+    create_time: datetime.datetime = field(init=False, default_factory=datetime.datetime.now)
+    location_map: dict = field(init=False, default_factory=dict)
+    lh_slots_mask: int = field(init=False, default=0)  # bit i is set if slot i in the liquid handler is in use
+    free_wells: dict = field(init=False, default_factory=dict)  # slot -> bitmask of free wells, for wellplates in the liquid handler
+    workbench_slots_mask: int = field(init=False, default=0)  # bit i is set if slot i in the workbench is in use
+    lock: threading.RLock = field(init=False, repr=False, default_factory=threading.RLock)  # held by OSS actions on this experiment
+    workbench_slot_ids: dict = field(init=False, default_factory=dict)  # slot -> number of location ids in that workbench slot
+    # TODO: add more experiment state here
+
+    def __post_init__(self):
+        logger.info("Experiment %s created", self.exp_id)
         
     def is_exist_location(self, loc_id: LocationId):
         """
@@ -44,7 +53,19 @@ class Experiment:
         bool: True if the location ID exists, False otherwise.
         """
 
-        return loc_id in self.location_map
+        return self.get_location_or_none(loc_id) is not None
+    
+    def get_location_or_none(self, loc_id: LocationId) -> Location | None:
+        """
+        Retrieve the physical location of a given location ID, if it exists.
+
+        Args:
+        loc_id (LocationId): The location ID to retrieve the physical location for.
+
+        Returns:
+        Location | None: The physical location corresponding to the given location ID, or None if it does not exist.
+        """
+        return self.location_map.get(loc_id)
     
     def get_location(self, loc_id: LocationId):
         """
@@ -59,7 +80,10 @@ class Experiment:
         Raises:
         Exception: Location ID does not exist in the experiment's location map.
         """
-        return self.location_map[loc_id]
+        location = self.get_location_or_none(loc_id)
+        if location is None:
+            raise Exception("Location does not exist")
+        return location
     
     def set_location(self, loc_id: LocationId, location: Location):
         """
@@ -72,13 +96,20 @@ class Experiment:
         Raises:
         Exception: Location ID already exists in the experiment's location map.
         """
-        logger.info(f"Experiment {self.exp_id}: Set location {loc_id} to {location}")
+        logger.info("Experiment %s: Set location %s to %s", self.exp_id, loc_id, location)
         if self.is_exist_location(loc_id):
             raise Exception("Location already exists")
         else:
             self.location_map[loc_id] = location
-            if location.equipment == Equipment.liquid_handler:
-                self.lh_slots_used.append(location.slot)
+            if location.equipment is _LIQUID_HANDLER:
+                self.lh_slots_mask |= 1 << location.slot
+                if location.labware is _WELLPLATE:
+                    wells = self.free_wells.get(location.slot, _ALL_WELLS_FREE)
+                    self.free_wells[location.slot] = wells & ~(1 << location.well_id)
+            elif location.equipment is _WORKBENCH:
+                # several location ids share a workbench slot when a wellplate is moved there
+                self.workbench_slots_mask |= 1 << location.slot
+                self.workbench_slot_ids[location.slot] = self.workbench_slot_ids.get(location.slot, 0) + 1
             
     def release_location(self, loc_id: LocationId):
         """
@@ -90,10 +121,26 @@ class Experiment:
         Raises:
         Exception: Location ID does not exist in the experiment's location map.
         """
-        logger.info(f"Experiment {self.exp_id}: Release location {loc_id}")
-        if self.is_exist_location(loc_id):
-            if self.location_map[loc_id].equipment == Equipment.liquid_handler:
-                self.lh_slots_used.remove(self.location_map[loc_id].slot)
+        logger.info("Experiment %s: Release location %s", self.exp_id, loc_id)
+        location = self.get_location_or_none(loc_id)
+        if location is not None:
+            if location.equipment is _LIQUID_HANDLER:
+                if location.labware is _WELLPLATE:
+                    self.free_wells[location.slot] |= 1 << location.well_id
+                    # wellplate is no longer in use once all its wells are free
+                    if self.free_wells[location.slot] == _ALL_WELLS_FREE:
+                        del self.free_wells[location.slot]
+                        self.lh_slots_mask &= ~(1 << location.slot)
+                else:
+                    self.lh_slots_mask &= ~(1 << location.slot)
+            elif location.equipment is _WORKBENCH:
+                # workbench slot is no longer in use once its last location id is released
+                num_ids = self.workbench_slot_ids[location.slot] - 1
+                if num_ids:
+                    self.workbench_slot_ids[location.slot] = num_ids
+                else:
+                    del self.workbench_slot_ids[location.slot]
+                    self.workbench_slots_mask &= ~(1 << location.slot)
             del self.location_map[loc_id]
         else:
             raise Exception("Location does not exist")
@@ -106,10 +153,9 @@ class Experiment:
         Returns:
         int | None: The empty slot number if found, None otherwise.
         """
-        for slot in range(WORKBENCH_MAX_SLOTS):
-            if slot not in self.location_map:
-                return slot
-        return None
+        # lowest clear bit of the mask
+        slot = (~self.workbench_slots_mask & (self.workbench_slots_mask + 1)).bit_length() - 1
+        return slot if slot < WORKBENCH_MAX_SLOTS else None
     
     # find an empty slot in the liquid handler
     def get_empty_slot(self) -> int | None:
@@ -119,10 +165,9 @@ class Experiment:
         Returns:
         int | None: The empty slot number if found, None otherwise.
         """
-        for slot in range(LH_MAX_SLOTS):
-            if slot not in self.lh_slots_used:
-                return slot
-        return None
+        # lowest clear bit of the mask
+        slot = (~self.lh_slots_mask & (self.lh_slots_mask + 1)).bit_length() - 1
+        return slot if slot < LH_MAX_SLOTS else None
         
     # find an empty well in a wellplate already inside a liquid handler
     def get_empty_well(self) -> Location | None:
@@ -134,36 +179,43 @@ class Experiment:
         otherwise None if no empty well is available.
         """
 
-        slot_well_list = {}
-        for id in self.location_map:
-            if self.location_map[id].equipment == Equipment.liquid_handler and \
-                self.location_map[id].labware == Labware.wellplate:
-                    if slot_well_list.get(self.location_map[id].slot, None) is None:
-                        slot_well_list[self.location_map[id].slot] = []
-                    slot_well_list[self.location_map[id].slot].append(
-                         self.location_map[id].well_id)
-        
-        for slot in slot_well_list:
-            for well in range(WELLPLATE_MAX_WELLS):
-                well_str = well_id_int_to_str(well)
-                if well_str not in slot_well_list[slot]:
-                    return Location(Equipment.liquid_handler, slot, Labware.wellplate, well_str)
+        for slot, wells in self.free_wells.items():
+            if wells:
+                # lowest set bit of the mask
+                well = (wells & -wells).bit_length() - 1
+                return make_location(_LIQUID_HANDLER, slot, _WELLPLATE, well)
         return None    
               
 # ===================================================================
 # OSS class definition
 
+# labware sorted by capacity, for best fit lookups (ties keep the enum order)
+_LABWARE_BY_CAPACITY = sorted(Labware, key=Labware.max_capacity)
+_LABWARE_CAPACITIES = [labware.max_capacity() for labware in _LABWARE_BY_CAPACITY]
+_WELLPLATE_CAPACITY = Labware.wellplate.max_capacity()
+
+# operator commands to run a measurement once the sample is in the spectroscope
+_SPECTROSCOPE_COMMANDS = (
+    'Select absorbance spectroscopy',
+    'Set all parameters using spectroscope"s UI',
+    'Press start button and wait for measurement to finish',
+    'Upload results to data folder when ready',
+)
+
 class OSS:
     
     # ---------------------------------------------------------------
     # OSS state
-    _next_exp_id = 0
+    _exp_ids = itertools.count(1)
     _exp_list = {}
     _operator = operator_lib.Operator()
     _lh = lh_lib.LiquidHandler()
-    _waste_reservoir = Location(Equipment.liquid_handler, 0, Labware.waste_reservoir, "")
-    _results_not_ready = False
-    _incubation_not_complete = False
+    _waste_reservoir = Location(Equipment.liquid_handler, 0, Labware.waste_reservoir, 0)
+    # set by the equipment when incubation or results are done, always set in simulation
+    _incubation_done = threading.Event()
+    _incubation_done.set()
+    _results_ready = threading.Event()
+    _results_ready.set()
               
     # ---------------------------------------------------------------
     # Experiment control functions
@@ -178,11 +230,11 @@ class OSS:
         Returns:
             int: Experiment ID
         """
-        OSS._next_exp_id += 1
-        logger.info(f"OSS: Experiment {OSS._next_exp_id}: Start {name}")
-        new_exp = Experiment(OSS._next_exp_id, name)
-        OSS._exp_list[OSS._next_exp_id] = new_exp
-        return OSS._next_exp_id
+        exp_id = next(OSS._exp_ids)
+        logger.info("OSS: Experiment %s: Start %s", exp_id, name)
+        new_exp = Experiment(exp_id, name)
+        OSS._exp_list[exp_id] = new_exp
+        return exp_id
 
     def experiment_end(self, exp_id: int):
         """
@@ -194,20 +246,39 @@ class OSS:
         Returns:
             None
         """
-        logger.info(f"OSS: Experiment {exp_id}: End")
-        if exp_id in OSS._exp_list:
-            del OSS._exp_list[exp_id]
-        else:
+        logger.info("OSS: Experiment %s: End", exp_id)
+        if OSS._exp_list.pop(exp_id, None) is None:
             raise Exception("Experiment does not exist")
 
     # ---------------------------------------------------------------
     # internal helper functions
     
     def __get_experiment(self, exp_id: int):
-        if exp_id in OSS._exp_list:
-            return OSS._exp_list[exp_id]
-        else:
+        exp = OSS._exp_list.get(exp_id)
+        if exp is None:
             raise Exception("Experiment does not exist")
+        return exp
+        
+    @staticmethod
+    def __best_fit_labware(vol: int, multi_dest: bool) -> Labware:
+        """
+        Pick the labware for a given volume, by binary search over the labware 
+        sorted by capacity.
+
+        Parameters:
+        vol (int): Volume of the liquid
+        multi_dest (bool): Whether the liquid goes to multiple destinations
+
+        Returns:
+        Labware: The smallest labware which can hold the volume, or a wellplate for multiple destinations
+        """
+        if multi_dest and _WELLPLATE_CAPACITY > vol:
+            return _WELLPLATE
+
+        i = bisect.bisect_left(_LABWARE_CAPACITIES, vol)
+        if i == len(_LABWARE_CAPACITIES):
+            raise Exception("No labware can hold the volume")
+        return _LABWARE_BY_CAPACITY[i]
         
     def __decide_location(self, exp: Experiment, vol: int, num_dests: int) -> tuple[Location, bool]:
         """
@@ -223,34 +294,129 @@ class OSS:
         Returns:
         tuple[Location, bool]: A Location object and a boolean indicating whether a new labware needs to be placed.
         """
-        if num_dests > 1 and Labware.wellplate.max_capacity() > vol:
-            best_fit = Labware.wellplate
-        else:
-            best_fit = None
-            for labware in Labware:
-                if labware.max_capacity() >= vol:
-                    if (not best_fit) or (labware.max_capacity() < best_fit.max_capacity()): 
-                        best_fit = labware
-            if not best_fit:
-                raise Exception("No labware can hold the volume")
-                        
-        empty_slot = exp.get_empty_slot()
-        if best_fit == Labware.wellplate:
+        return self.__allocate_labware(exp, self.__best_fit_labware(vol, num_dests > 1))
+    
+    def __allocate_labware(self, exp: Experiment, labware: Labware) -> tuple[Location, bool]:
+        """
+        Find a location in the liquid handler for a given labware. A wellplate already 
+        present with an empty well is reused, otherwise the labware goes to an empty slot.
+
+        Parameters:
+        exp (Experiment): Experiment object
+        labware (Labware): Labware to allocate
+
+        Returns:
+        tuple[Location, bool]: A Location object and a boolean indicating whether a new labware needs to be placed.
+        """
+        if labware is _WELLPLATE:
             # check is wellplate is already present with empty well
             empty_well = exp.get_empty_well()
             if empty_well:
                 return empty_well, False
-            else:
-                # add a new wellplate in an empty slot
-                if empty_slot is None:
-                    raise Exception("No empty slot in liquid handler")
-                return Location(equipment=Equipment.liquid_handler, slot=empty_slot, 
-                                labware=best_fit, well_id='A0'), True
-        else:
-            if empty_slot is None:
-                raise Exception("No empty slot in liquid handler")
-            return Location(equipment=Equipment.liquid_handler, slot=empty_slot, 
-                            labware=best_fit, well_id='A0'), True
+            
+        # add a new labware in an empty slot
+        empty_slot = exp.get_empty_slot()
+        if empty_slot is None:
+            raise Exception("No empty slot in liquid handler")
+        return make_location(_LIQUID_HANDLER, empty_slot, labware, 0), True
+    
+    def __map_locations(self, exp: Experiment, dest_id: list[LocationId], vol: int, 
+                        num_dests: int) -> list[Location]:
+        """
+        Map the location ids which are not mapped yet to physical locations, and ask 
+        the operator to place any new labware. The labware is decided once, on the first 
+        id which is not mapped yet, and used for all of them.
+
+        Parameters:
+        exp (Experiment): Experiment object
+        dest_id (list[LocationId]): Location ids of the destinations
+        vol (int): Volume of the liquid in each destination
+        num_dests (int): Number of destinations
+
+        Returns:
+        list[Location]: Physical location of each destination
+        """
+        best_fit = None
+        dests = []
+        for id in dest_id:
+            dest = exp.get_location_or_none(id)
+            if dest is None:
+                # mapped destinations need no labware, so their volume is not checked
+                if best_fit is None:
+                    best_fit = self.__best_fit_labware(vol, num_dests > 1)
+                dest, is_new = self.__allocate_labware(exp, best_fit)
+                exp.set_location(id, dest)
+
+                # operator: prepare the destination
+                if is_new: 
+                    self._operator.command(f'Move in place {dest}')
+            dests.append(dest)
+        return dests
+          
+    @staticmethod
+    def __serpentine_key(location: Location) -> tuple[int, int]:
+        row, col = divmod(location.well_id, WELLPLATE_ROW_SIZE)
+        return row, col if row % 2 == 0 else -col
+
+    def __plan_batches(self, dests: list[Location], vols: list[int], 
+                       batch_size: int) -> list[list[tuple[Location, int]]]:
+        """
+        Group destinations into batches which can be served by a single aspirate.
+        Destinations are grouped by labware (same equipment, slot and labware), 
+        and each group is split into batches of at most batch_size destinations,
+        whose volumes together fit in the tip.
+        Wells of a wellplate are visited in serpentine order (alternate rows reversed)
+        so that the pipette does not travel back to the start of every row.
+
+        Parameters:
+        dests (list[Location]): Physical locations of the destinations
+        vols (list[int]): Volume to dispense in each destination
+        batch_size (int): Maximum number of destinations in a batch
+
+        Returns:
+        list[list[tuple[Location, int]]]: List of batches, each a list of (destination location, volume)
+        """
+        groups = {}
+        for dest, vol in zip(dests, vols):
+            groups.setdefault((dest.equipment, dest.slot, dest.labware), []).append((dest, vol))
+        
+        batches = []
+        for (_, _, labware), group in groups.items():
+            if labware is _WELLPLATE:
+                group.sort(key=lambda item: self.__serpentine_key(item[0]))
+            batch, batch_vol = [], 0
+            for dest, vol in group:
+                if batch and (len(batch) == batch_size or batch_vol + vol > TIP_CAPACITY):
+                    batches.append(batch)
+                    batch, batch_vol = [], 0
+                batch.append((dest, vol))
+                batch_vol += vol
+            batches.append(batch)
+        return batches
+          
+    def __get_reservoir(self, exp: Experiment, dest_id: LocationId) -> tuple[Location, bool]:
+        """
+        Get the reservoir for a location id, placing a new reservoir in an empty slot
+        of the liquid handler if the location id is seen for the first time.
+
+        Parameters:
+        exp (Experiment): Experiment object
+        dest_id (LocationId): Location id of the reservoir
+
+        Returns:
+        tuple[Location, bool]: The reservoir location and a boolean indicating whether it is newly placed.
+        """
+        dest = exp.get_location_or_none(dest_id)
+        if dest is not None:
+            return dest, False
+        
+        empty_slot = exp.get_empty_slot()
+        if empty_slot is None:
+            raise Exception("No empty slot in liquid handler")
+        
+        dest = make_location(_LIQUID_HANDLER, empty_slot, _RESERVOIR, 0)
+        exp.set_location(dest_id, dest)
+        return dest, True
           
     # ---------------------------------------------------------------
     # Experiment actions 
@@ -271,66 +437,106 @@ class OSS:
         Raises:
             Exception: No empty slot in liquid handler
         """
-        logger.info(f"OSS: Experiment {exp_id}: Load {vol}ul of {solution} to {dest_id}")
+        logger.info("OSS: Experiment %s: Load %sul of %s to %s", exp_id, vol, solution, dest_id)
 
         exp = self.__get_experiment(exp_id)
-
-        # map location id seen for the first time to physical locations
-        if not exp.is_exist_location(dest_id):
-            empty_slot = exp.get_empty_slot()
-            if empty_slot is None:
-                raise Exception("No empty slot in liquid handler")
-            
-            dest = Location(equipment=Equipment.liquid_handler, slot=empty_slot, 
-                            labware=Labware.reservoir, well_id='A0')
-            exp.set_location(dest_id, dest)
-
-            # operator: prepare the destination
-            self._operator.command(f'Move in place {dest}')
+        with exp.lock:
+            # map location id seen for the first time to physical locations
+            dest, is_new = self.__get_reservoir(exp, dest_id)
+            if is_new:
+                # operator: prepare the destination
+                self._operator.command(f'Move in place {dest}')
     
-        # operator: bring reagent from store to reservoir
-        #self.operator.move(vol, solution, exp.get_location(dest_id))
-        self._operator.command(f'Move {vol}ul of {solution} to {exp.get_location(dest_id)}')
+            # operator: bring reagent from store to reservoir
+            #self.operator.move(vol, solution, dest)
+            self._operator.command(f'Move {vol}ul of {solution} to {dest}')
 
-    def discard(self, exp_id: int, vol: int, source_id: LocationId, release_labware: bool = False):
+    def load_many(self, exp_id: int, items: list[tuple[int, Material, LocationId]]):
         """
-        Discard a given volume of a liquid from a specified location id, and optionally release the labware.
+        Load several solutions in one call. Each item is handled as in load, but all 
+        destinations are resolved first. The operator then places all new reservoirs
+        and afterwards brings all reagents, both in slot order, so that fetching 
+        reagents is a single independent step that the operator can do in parallel.
 
         Args:
             exp_id (int): Experiment id
-            vol (int): Volume of the liquid to be discarded
-            source_id (LocationId): Location id of the source to be discarded
-            release_labware (bool, optional): Whether to release the labware from the source location. Defaults to False.
+            items (list[tuple[int, Material, LocationId]]): List of (volume, solution, destination location id) to load
 
         Raises:
-            Exception: Source location does not exist
+            Exception: No empty slot in liquid handler
         """
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("OSS: Experiment %s: Load %s", exp_id, [f'{vol}ul of {solution} to {id}' for vol, solution, id in items])
 
-        logger.info(f"OSS: Experiment {exp_id}: Discard {source_id}")
         exp = self.__get_experiment(exp_id)
+        with exp.lock:
+            # map location ids seen for the first time to physical locations
+            loads = []
+            for vol, solution, dest_id in items:
+                dest, is_new = self.__get_reservoir(exp, dest_id)
+                loads.append((dest, is_new, vol, solution))
+            loads.sort(key=lambda load: load[0].slot)
+
+            # operator: prepare all the destinations
+            for dest, is_new, _, _ in loads:
+                if is_new:
+                    self._operator.command(f'Move in place {dest}')
+            # operator: bring reagents from store to reservoirs
+            for dest, _, vol, solution in loads:
+                self._operator.command(f'Move {vol}ul of {solution} to {dest}')
+
+    def discard(self, exp_id: int, vol: int, source_id: LocationId | list[LocationId], release_labware: bool = False):
+        """
+        Discard a given volume of a liquid from a specified location id (or a list of location ids), and optionally release the labware.
 
-        if not exp.is_exist_location(source_id):
-            raise Exception("Source location does not exist")
+        Args:
+            exp_id (int): Experiment id
+            vol (int): Volume of the liquid to be discarded
+            source_id (LocationId | list[LocationId]): Location id(s) of the source to be discarded
+            release_labware (bool, optional): Whether to release the labware from the source location. 
+                Labware shared by several source ids (e.g. a wellplate) is returned to storage once. Defaults to False.
 
-        if exp.get_location(source_id).equipment == Equipment.liquid_handler:
-            # if source is in LH, transfer within LH
-            self._lh.move_pipette(exp.get_location(source_id))
-            self._lh.aspirate(vol)
-            self._lh.move_pipette(self._waste_reservoir)
-            self._lh.dispense(vol)
+        Raises:
+            Exception: Source location does not exist
+        """
+        # always convert source_id to list for uniform handling from here on
+        if isinstance(source_id, list):
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("OSS: Experiment %s: Discard %s", exp_id, [str(id) for id in source_id])
         else:
-            # Ask operator to discard the contents
-            self._operator.command(f'Discard {exp.get_location(source_id)} contents to waste reservoir')
+            logger.info("OSS: Experiment %s: Discard %s", exp_id, source_id)
+            source_id = [source_id]
+        exp = self.__get_experiment(exp_id)
+        with exp.lock:
+            sources = [exp.get_location_or_none(id) for id in source_id]
+            if any(source is None for source in sources):
+                raise Exception("Source location does not exist")
+
+            for source in sources:
+                if source.equipment is _LIQUID_HANDLER:
+                    # if source is in LH, transfer within LH
+                    self._lh.move_pipette(source)
+                    self._lh.aspirate(vol)
+                    self._lh.move_pipette(self._waste_reservoir)
+                    self._lh.dispense(vol)
+                else:
+                    # Ask operator to discard the contents
+                    self._operator.command(f'Discard {source} contents to waste reservoir')
         
-        if release_labware:
-            # Ask operator to return labware to storage
-            self._operator.command(f'Return {exp.get_location(source_id)} to storage')
-            # Release the location
-            exp.release_location(source_id)
+            if release_labware:
+                # Ask operator to return each labware to storage once
+                returned = set()
+                for id, source in zip(source_id, sources):
+                    labware = (source.equipment, source.slot, source.labware)
+                    if labware not in returned:
+                        returned.add(labware)
+                        self._operator.command(f'Return [{source.equipment}:slot-{source.slot}:{source.labware}] to storage')
+                    # Release the location
+                    exp.release_location(id)
         
-    def transfer(self, exp_id: int, vol: int, source_id: LocationId, 
+    def transfer(self, exp_id: int, vol: int | list[int], source_id: LocationId, 
                  dest_id: LocationId | list[LocationId], discard_tip:bool = True, 
-                 dest_id_list: list[LocationId] | None = None):
+                 dest_id_list: list[LocationId] | None = None, multi_dispense: bool = True):
         """
         Transfer a given volume of a solution from a source location id to a destination location id (or a list of destination location ids).
         
@@ -339,51 +545,82 @@ class OSS:
 
         Args:
             exp_id (int): Experiment id
-            vol (int): Volume of the solution to transfer
+            vol (int | list[int]): Volume of the solution to transfer, or one volume per destination
             source_id (LocationId): Location id of the source
             dest_id (LocationId | list[LocationId]): Location id of the destination(s)
             discard_tip (bool, optional): Whether to discard the tip after the transfer. Defaults to True.
             dest_id_list (list[LocationId], optional): If a single dest_id is provided, but it is a part of a list, then the list is passed here. Defaults to None.
+            multi_dispense (bool, optional): Whether to aspirate once for several destinations and dispense into each in turn,
+                as long as the total volume fits in the tip. Defaults to True.
 
         Raises:
             Exception: Source location does not exist
+            Exception: Number of volumes does not match number of destinations
         """
         # dest_id could be a single location id or a list of location ids 
-        # always convert dest_id to list for uniform handling from here on
-        if not isinstance(dest_id, list):
-            dest_id = [dest_id]
+        is_single = not isinstance(dest_id, list)
 
-        logger.info(f"OSS: Experiment {exp_id}: Transfer {vol}ul from {source_id} to {[str(id) for id in dest_id]}")
+        if logger.isEnabledFor(logging.INFO):
+            dest_names = [str(dest_id)] if is_single else [str(id) for id in dest_id]
+            logger.info("OSS: Experiment %s: Transfer %sul from %s to %s", exp_id, vol, source_id, dest_names)
 
         exp = self.__get_experiment(exp_id)
+        with exp.lock:
+            source = exp.get_location_or_none(source_id)
+            if source is None:
+                raise Exception("Source location does not exist")
         
-        if not exp.is_exist_location(source_id):
-            raise Exception("Source location does not exist")
-        
-        # TODO: get tip rack and attach tip to pipette if needed
+            # TODO: get tip rack and attach tip to pipette if needed
         
-        # for each dest_id, map it to physical location if needed
-        for id in dest_id:
-            if not exp.is_exist_location(id):
-                dest, is_new = self.__decide_location(exp, vol, len(dest_id) if dest_id_list is None else len(dest_id_list))
-                exp.set_location(id, dest)
-
-                # operator: prepare the destination
-                if is_new: 
-                    #self.operator.place(dest)
-                    self._operator.command(f'Move in place {dest}')
+            # single destination: a single aspirate and dispense, no batching needed
+            if is_single:
+                # a volume list for a single destination must hold exactly one volume
+                if isinstance(vol, list):
+                    if len(vol) != 1:
+                        raise Exception("Number of volumes does not match number of destinations")
+                    vol = vol[0]
+                num_dests = 1 if dest_id_list is None else len(dest_id_list)
+                [dest] = self.__map_locations(exp, [dest_id], vol, num_dests)
+                self._lh.move_pipette(source)
+                self._lh.aspirate(vol)
+                self._lh.move_pipette(dest)
+                self._lh.dispense(vol)
+                if discard_tip: self._lh.discard_tip()
+                return
+
+            # vol could be a single volume for all destinations or one volume per destination
+            if isinstance(vol, list):
+                if len(vol) != len(dest_id):
+                    raise Exception("Number of volumes does not match number of destinations")
+                vols = vol
+            else:
+                vols = [vol] * len(dest_id)
+
+            # map each dest_id to physical location if needed
+            num_dests = len(dest_id) if dest_id_list is None else len(dest_id_list)
+            if isinstance(vol, list):
+                dests = []
+                for id, dest_vol in zip(dest_id, vols):
+                    dests += self.__map_locations(exp, [id], dest_vol, num_dests)
+            else:
+                dests = self.__map_locations(exp, dest_id, vol, num_dests)
                     
-            # LH: move solution from source to destination
-            self._lh.move_pipette(exp.get_location(source_id))
-            self._lh.aspirate(vol)
-            self._lh.move_pipette(exp.get_location(id))
-            self._lh.dispense(vol)
+            # LH: move solution from source to destinations, one batch per aspirate
+            # a batch is limited by the number of channels and by what fits in the tip
+            batch_size = LH_NUM_CHANNELS if multi_dispense else 1
+            move_pipette, aspirate, dispense = self._lh.move_pipette, self._lh.aspirate, self._lh.dispense
+            for batch in self.__plan_batches(dests, vols, batch_size):
+                move_pipette(source)
+                aspirate(sum(dest_vol for _, dest_vol in batch))
+                for dest, dest_vol in batch:
+                    move_pipette(dest)
+                    dispense(dest_vol)
         
-        # discard tip if required
-        if discard_tip: self._lh.discard_tip()
+            # discard tip if required
+            if discard_tip: self._lh.discard_tip()
         
 
-    def mix(self, exp_id: int, dest_id: LocationId, vol: int, mix_count: int = 3):
+    def mix(self, exp_id: int, dest_id: LocationId | list[LocationId], vol: int, mix_count: int = 3):
         """
         Mix a specified volume of liquid at a given destination location a certain number of times.
 
@@ -394,7 +631,7 @@ class OSS:
         
         Args:
             exp_id (int): Experiment ID.
-            dest_id (LocationId): The location ID where the mixing should occur.
+            dest_id (LocationId | list[LocationId]): The location ID (or list of location IDs) where the mixing should occur.
             vol (int): Volume of the liquid to be mixed.
             mix_count (int, optional): Number of times the mixing should occur. Defaults to 3.
 
@@ -402,35 +639,42 @@ class OSS:
             Exception: If the destination location does not exist.
         """
 
-        logger.info(f"OSS: Experiment {exp_id}: Mix {dest_id} {mix_count} times")
+        # mix each destination of a list in turn
+        if isinstance(dest_id, list):
+            for id in dest_id:
+                self.mix(exp_id, id, vol, mix_count)
+            return
+
+        logger.info("OSS: Experiment %s: Mix %s %s times", exp_id, dest_id, mix_count)
         exp = self.__get_experiment(exp_id)
+        with exp.lock:
+            dest = exp.get_location_or_none(dest_id)
+            if dest is None:
+                raise Exception("Destination location does not exist")
         
-        if not exp.is_exist_location(dest_id):
-            raise Exception("Destination location does not exist")
-        
-        # mix happens in an LH, so if the destination is not in the LH, move it there
-        lh_dest = dest = exp.get_location(dest_id)
-        if  dest.equipment != Equipment.liquid_handler:
-            lh_dest, is_new = self.__decide_location(exp, vol, 1)
-            exp.set_location(dest_id, lh_dest)            
-            if is_new: self._operator.command(f'Move in place {lh_dest}')
-            self._operator.command(f'Move {dest} to {lh_dest}')
+            # mix happens in an LH, so if the destination is not in the LH, move it there
+            lh_dest = dest
+            if dest.equipment is not _LIQUID_HANDLER:
+                lh_dest, is_new = self.__decide_location(exp, vol, 1)
+                exp.set_location(dest_id, lh_dest)            
+                if is_new: self._operator.command(f'Move in place {lh_dest}')
+                self._operator.command(f'Move {dest} to {lh_dest}')
             
-        # TODO: check if pipette tip can handle vol
+            # TODO: check if pipette tip can handle vol
         
-        # mix it now
-        self._lh.move_pipette(lh_dest)
-        for i in range(mix_count):
-            self._lh.aspirate(vol)
-            self._lh.dispense(vol)
+            # mix it now
+            self._lh.move_pipette(lh_dest)
+            for i in range(mix_count):
+                self._lh.aspirate(vol)
+                self._lh.dispense(vol)
             
-        # move it back to original location
-        if dest.equipment != Equipment.liquid_handler:
-            exp.set_location(dest_id, dest)
-            self._operator.command(f'Move {lh_dest} to {dest}')    
+            # move it back to original location
+            if dest.equipment is not _LIQUID_HANDLER:
+                exp.set_location(dest_id, dest)
+                self._operator.command(f'Move {lh_dest} to {dest}')    
             
-        # discard tip
-        self._lh.discard_tip()    
+            # discard tip
+            self._lh.discard_tip()    
         
     def incubate(self, exp_id: int, target_id: list[LocationId], temperature: int, duration: int, dark:bool = False):
         """
@@ -448,14 +692,17 @@ class OSS:
         Raises:
             Exception: If experiment id does not exist
         """
-        logger.info(f"OSS: Experiment {exp_id}: Incubate {[str(id) for id in target_id]} at {temperature} degrees for {duration} minutes")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("OSS: Experiment %s: Incubate %s at %s degrees for %s minutes", 
+                        exp_id, [str(id) for id in target_id], temperature, duration)
         exp = self.__get_experiment(exp_id)
         
         self._operator.command(f'Incubate {[str(id) for id in target_id]} at {temperature} degrees for {duration} minutes')
 
         # Wait for incubation to complete
-        while(self._incubation_not_complete):
-            time.sleep(1)
+        if not self._incubation_done.is_set():
+            flush_log()  # the wait may be long, write out the log first
+        self._incubation_done.wait()
                     
     def measure_absorbance(self, exp_id: int, 
                            target_id: list[LocationId], 
@@ -506,84 +753,80 @@ class OSS:
         Returns:
             list[int]: List of measured absorbance values corresponding to the target locations
         """
-        logger.info(f"OSS: Experiment {exp_id}: Measure absorbance of {[str(id) for id in target_id]} at {wavelength_range} nm")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("OSS: Experiment %s: Measure absorbance of %s at %s nm", 
+                        exp_id, [str(id) for id in target_id], wavelength_range)
         exp = self.__get_experiment(exp_id)
+        with exp.lock:
+            # add blank well ids to the list of targets for measurement
+            target_id = target_id + blank_id
         
-        # add blank well ids to the list of targets for measurement
-        target_id = target_id + blank_id
-        
-        # check if all target locations exist
-        if any([not exp.is_exist_location(id) for id in target_id]): 
-            raise Exception("Some Target location does not exist")
+            # check if all target locations exist
+            locs = [exp.get_location_or_none(id) for id in target_id]
+            if any(loc is None for loc in locs): 
+                raise Exception("Some Target location does not exist")
 
-        results = []
+            results = []
         
-        # check if all target locations are in the same well plate
-        if all([exp.get_location(id).labware == Labware.wellplate for id in target_id]):
-            # assume a single well plate, raise exception if not
-            if len(set([exp.get_location(id).slot for id in target_id])) > 1:
-                raise Exception("All target locations must be in the same well plate")
+            # check if all target locations are in the same well plate
+            if all(loc.labware is _WELLPLATE for loc in locs):
+                # assume a single well plate, raise exception if not
+                first_slot = locs[0].slot
+                if not all(loc.slot == first_slot for loc in locs):
+                    raise Exception("All target locations must be in the same well plate")
+                else:
+                    dest = locs[0]
+                    # if a single well plate, measure all at once
+                    self._operator.run_protocol([f'Move {dest} to spectroscope', *_SPECTROSCOPE_COMMANDS])
+
+                    # Wait for result file to be ready
+                    if not self._results_ready.is_set():
+                        flush_log()  # the wait may be long, write out the log first
+                    self._results_ready.wait()
+                    
+                    # download the result file and map it back to logical ids
+                    results = [1] * len(target_id)
+                
+                    # transfer wellplate to workbench
+                    slot = exp.get_empty_workbench_slot()
+                    if slot is None:
+                        raise Exception("No empty workbench slot")
+
+                    # update location mapping for all location ids                
+                    for id, loc in zip(target_id, locs):
+                        dest = make_location(_WORKBENCH, slot, _WELLPLATE, loc.well_id)
+                        exp.release_location(id)
+                        exp.set_location(id, dest)
+
+                    self._operator.command(f'Move wellplate to {dest}')
             else:
-                dest = exp.get_location(target_id[0])
-                # if a single well plate, measure all at once
-                self._operator.command(f'Move {dest} to spectroscope')
-                self._operator.command(f'Select absorbance spectroscopy')
-                self._operator.command(f'Set all parameters using spectroscope"s UI')
-                self._operator.command(f'Press start button and wait for measurement to finish')
-                self._operator.command(f'Upload results to data folder when ready')
-
-                # Wait for result file to be ready
-                while(self._results_not_ready):
-                    time.sleep(1)
+                # if not a single well plate, move each target to cuvette 
+                # and measure one by one
+                for id, dest in zip(target_id, locs):
+                    # trasfer to cuvette and measure
+                    self._operator.run_protocol([f'Move {dest} to cuvette', 'Move cuvette to spectroscope', 
+                                                 *_SPECTROSCOPE_COMMANDS])
+
+                    # Wait for result file to be ready
+                    if not self._results_ready.is_set():
+                        flush_log()  # the wait may be long, write out the log first
+                    self._results_ready.wait()
                     
-                # download the result file and map it back to logical ids
-                results = [1] * len(target_id)
+                    # download the result file and map it back to logical ids
+                    results.append(1)
                 
-                # transfer wellplate to workbench
-                dest.equipment = Equipment.workbench
-                dest.slot = exp.get_empty_workbench_slot()
-                if dest.slot is None:
-                    raise Exception("No empty workbench slot")
-
-                # update location mapping for all location ids                
-                for id in target_id:
-                    dest.well_id = exp.get_location(id).well_id
+                    # find available slot in workbench 
+                    slot = exp.get_empty_workbench_slot()
+                    if slot is None:
+                        raise Exception("No empty workbench slot")
+                    dest = make_location(_WORKBENCH, slot, dest.labware, dest.well_id)
                     exp.release_location(id)
                     exp.set_location(id, dest)
-
-                self._operator.command(f'Move wellplate to {dest}')
-        else:
-            # if not a single well plate, move each target to cuvette 
-            # and measure one by one
-            for id in target_id:
-                dest = exp.get_location(id)
-                # trasfer to cuvette and measure
-                self._operator.command(f'Move {dest} to cuvette')
-                self._operator.command(f'Move cuvette to spectroscope')
-                self._operator.command(f'Select absorbance spectroscopy')
-                self._operator.command(f'Set all parameters using spectroscope"s UI')
-                self._operator.command(f'Press start button and wait for measurement to finish')
-                self._operator.command(f'Upload results to data folder when ready')
-
-                # Wait for result file to be ready
-                while(self._results_not_ready):
-                    time.sleep(1)
-                    
-                # download the result file and map it back to logical ids
-                results.append(1)
-                
-                # find available slot in workbench 
-                dest.equipment = Equipment.workbench
-                dest.slot = exp.get_empty_workbench_slot()
-                if dest.slot is None:
-                    raise Exception("No empty workbench slot")
-                exp.release_location(id)
-                exp.set_location(id, dest)
                 
-                # transfer back to labware and move to workbench
-                self._operator.command(f'Move cuvette to {dest}')
+                    # transfer back to labware and move to workbench
+                    self._operator.command(f'Move cuvette to {dest}')
                 
-        return results
+            return results
     
     # ---------------------------------------------------------------
     
@@ -1,10 +1,22 @@
+import enum
 from oss_utils import logger
 from collections import Counter
 
+# OSS functions tracked by the stub
+class Action(enum.IntEnum):
+    load = 0
+    load_many = 1
+    discard = 2
+    transfer = 3
+    mix = 4
+    incubate = 5
+    measure_absorbance = 6
+
+# counters are shared by all instances, so calls made through researcher_lib are included
 class OSS:
-    func_calls = Counter()
-    num_actions = Counter()
-    material_required = Counter()
+    func_calls = [0] * len(Action)
+    num_actions = [0] * len(Action)
+    material_required = Counter()  # keyed by material name, so separately created materials with the same name add up
     
     def experiment_init(self, name: str):
         logger.info("OSS.experiment_init called (stub)")
@@ -12,36 +24,45 @@ class OSS:
 
     def experiment_end(self, exp_id: int):
         logger.info("OSS.experiment_end called (stub)\n")
-        for f in self.func_calls.keys():
-            logger.debug(f"{f:25}: {self.func_calls[f]:4} calls, {self.num_actions[f]:4} actions")
-        for m in self.material_required.keys():
-            logger.info(f"Material {m:30}: {self.material_required[m]:4} units required")
+        for action in Action:
+            if self.func_calls[action]:
+                logger.debug("%-25s: %4d calls, %4d actions", action.name, self.func_calls[action], self.num_actions[action])
+        for name, units in self.material_required.items():
+            logger.info("Material %-30s: %4d units required", name, units)
             
     def load(self, exp_id: int, vol: int, solution, dest_id):
         logger.debug("OSS.load called (stub)")
-        self.func_calls['load'] += 1
-        self.num_actions['load'] += len(dest_id) if isinstance(dest_id, list) else 1
-        self.material_required[solution.name] += vol if not isinstance(dest_id, list) else vol*len(dest_id)
+        num_dests = len(dest_id) if isinstance(dest_id, list) else 1
+        self.func_calls[Action.load] += 1
+        self.num_actions[Action.load] += num_dests
+        self.material_required[solution.name] += vol * num_dests
+
+    def load_many(self, exp_id: int, items):
+        logger.debug("OSS.load_many called (stub)")
+        self.func_calls[Action.load_many] += 1
+        self.num_actions[Action.load_many] += len(items)
+        for vol, solution, dest_id in items:
+            self.material_required[solution.name] += vol
 
     def discard(self, exp_id: int, vol: int, source_id, release_labware: bool = False):
         logger.debug("OSS.discard called (stub)")
-        self.func_calls['discard'] += 1
-        self.num_actions['discard'] += 1
+        self.func_calls[Action.discard] += 1
+        self.num_actions[Action.discard] += len(source_id) if isinstance(source_id, list) else 1
 
-    def transfer(self, exp_id: int, vol: int, source_id, dest_id, discard_tip: bool = True, dest_id_list=None):
+    def transfer(self, exp_id: int, vol: int, source_id, dest_id, discard_tip: bool = True, dest_id_list=None, multi_dispense: bool = True):
         logger.debug("OSS.transfer called (stub)")
-        self.func_calls['transfer'] += 1
-        self.num_actions['transfer'] += len(dest_id) if isinstance(dest_id, list) else 1
+        self.func_calls[Action.transfer] += 1
+        self.num_actions[Action.transfer] += len(dest_id) if isinstance(dest_id, list) else 1
 
     def mix(self, exp_id: int, dest_id, vol: int, mix_count: int = 3):
         logger.debug("OSS.mix called (stub)")
-        self.func_calls['mix'] += 1
-        self.num_actions['mix'] += len(dest_id) if isinstance(dest_id, list) else 1
+        self.func_calls[Action.mix] += 1
+        self.num_actions[Action.mix] += len(dest_id) if isinstance(dest_id, list) else 1
 
     def incubate(self, exp_id: int, target_id, temperature: int, duration: int, dark: bool = False):
         logger.debug("OSS.incubate called (stub)")
-        self.func_calls['incubate'] += 1
-        self.num_actions['incubate'] += 1
+        self.func_calls[Action.incubate] += 1
+        self.num_actions[Action.incubate] += 1
 
     def measure_absorbance(self, exp_id: int, target_id, wavelength_range, blank_id=None, scan_step: int = 5,
                            reference_wavelength: int = 0, wait_time: int = 10, read_direction: str = 'row',
@@ -49,5 +70,5 @@ class OSS:
                            shake: str = "auto", shake_frequency='auto', shake_amplitude: int = 2,
                            shake_duration='auto', mix_settle_time: int = 10, retain_cover: bool = False):
         logger.debug("OSS.measure_absorbance called (stub)")
-        self.func_calls['measure_absorbance'] += 1
-        self.num_actions['measure_absorbance'] += 1
+        self.func_calls[Action.measure_absorbance] += 1
+        self.num_actions[Action.measure_absorbance] += 1
@@ -1,103 +1,138 @@
 import enum
+import functools
 import logging
+import logging.handlers
+from dataclasses import dataclass, field
 
 # -------------------------------------------------------------------
 # Logger initialization
 
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s %(message)s',
-    handlers=[logging.FileHandler('oss.log'), logging.StreamHandler()]
-    )
+# configure logging only if the application has not done it already
+# log file writes are buffered and flushed every 64 records, on errors, at exit and by flush_log.
+# Trade-off: up to 64 INFO records are only in memory, so oss.log lags behind the console and 
+# they are lost if the process is killed. OSS calls flush_log before waiting on equipment, 
+# which can take hours, so the log is complete while a run is blocked.
+if not logging.getLogger().handlers:
+    _LOG_FORMAT = '%(asctime)s %(message)s'
+    _log_file = logging.FileHandler('oss.log')
+    _log_file.setFormatter(logging.Formatter(_LOG_FORMAT))
+    logging.basicConfig(
+        level=logging.INFO, 
+        format=_LOG_FORMAT,
+        handlers=[logging.handlers.MemoryHandler(64, logging.ERROR, _log_file), logging.StreamHandler()]
+        )
 logger = logging.getLogger()
 
+def flush_log():
+    """
+    Write out any buffered log records, e.g. before blocking for a long time.
+    """
+    for handler in logger.handlers:
+        handler.flush()
+
 # -------------------------------------------------------------------
 # Equipment class
 
 class Equipment(enum.Enum):
-    workbench = 0,
-    liquid_handler = 1,
-    incubator = 2,
+    workbench = 0
+    liquid_handler = 1
+    incubator = 2
     spectroscope = 3
     
     def __str__(self) -> str:
-        return self.name
+        # _name_ is a plain attribute, name goes through a slower enum property
+        return self._name_
     
 WORKBENCH_MAX_SLOTS = 20
 LH_MAX_SLOTS = 12
+LH_NUM_CHANNELS = 8
+TIP_CAPACITY = 200
 
 # -------------------------------------------------------------------
 # Labware class
 
 class Labware (enum.Enum):
-    waste_reservoir = 0,
-    reservoir = 1,
-    wellplate = 2,
-    testtube = 3,
+    waste_reservoir = 0
+    reservoir = 1
+    wellplate = 2
+    testtube = 3
     cuvette = 4
 
     def max_capacity(self) -> int:
-        if self == Labware.waste_reservoir:
-            return 0
-        elif self == Labware.reservoir:
-            return 1000
-        elif self == Labware.wellplate:
-            return 50
-        elif self == Labware.testtube:
-            return 100
-        elif self == Labware.cuvette:
-            return 100
-        else:
-            raise Exception("Unknown labware")
+        return _MAX_CAPACITY[self]
         
     def min_capacity(self) -> int:
-        if self == Labware.waste_reservoir:
-            return 0
-        elif self == Labware.reservoir:
-            return 50
-        elif self == Labware.wellplate:
-            return 10
-        elif self == Labware.testtube:
-            return 10
-        elif self == Labware.cuvette:
-            return 10
-        else:
-            raise Exception("Unknown labware")
+        return _MIN_CAPACITY[self]
         
     def __str__(self) -> str:
-        return self.name
+        return self._name_
+
+# capacity of each labware in ul
+_MAX_CAPACITY = {
+    Labware.waste_reservoir: 0,
+    Labware.reservoir: 1000,
+    Labware.wellplate: 50,
+    Labware.testtube: 100,
+    Labware.cuvette: 100,
+}
+_MIN_CAPACITY = {
+    Labware.waste_reservoir: 0,
+    Labware.reservoir: 50,
+    Labware.wellplate: 10,
+    Labware.testtube: 10,
+    Labware.cuvette: 10,
+}
 
 WELLPLATE_MAX_WELLS = 96
 WELLPLATE_ROW_SIZE = 8  
 
+# well ids are a small fixed set, so conversions are table lookups
+_WELL_IDS = tuple(chr(well // WELLPLATE_ROW_SIZE + ord('A')) + str(well % WELLPLATE_ROW_SIZE) 
+                  for well in range(WELLPLATE_MAX_WELLS))
+# lower case ids are included so lookups need no case conversion
+_WELL_IDX = {id: well for well, well_id in enumerate(_WELL_IDS) for id in (well_id, well_id.lower())}
+
 def well_id_str_to_int(well_id: str) -> int:
-    return int(well_id[1:]) + ord(well_id[0].upper()) - ord('A') * WELLPLATE_ROW_SIZE
+    return _WELL_IDX[well_id]
 
 def well_id_int_to_str(well_id: int) -> str:
-    return chr(well_id // WELLPLATE_ROW_SIZE + ord('A')) + str(well_id % WELLPLATE_ROW_SIZE)
+    return _WELL_IDS[well_id]
 
 # -------------------------------------------------------------------
 # Location class
 
+@dataclass(frozen=True, slots=True)
 class Location:
-    def __init__(self, equipment: Equipment, slot: int, labware: Labware, well_id: str):
-        self.equipment = equipment
-        self.slot = slot
-        self.labware = labware
-        self.well_id = well_id
+    equipment: Equipment
+    slot: int
+    labware: Labware
+    well_id: int  # well number, shown as A0..L7 for wellplates
+    _str: str | None = field(init=False, default=None, repr=False, compare=False)  # cached result of __str__
         
     def __str__(self):
-        if self.labware == Labware.wellplate:
-            return f"[{self.equipment}:slot-{self.slot}:{self.labware}:{self.well_id}]"
-        else:
-            return f"[{self.equipment}:slot-{self.slot}:{self.labware}]"
+        if self._str is None:
+            if self.labware is Labware.wellplate:
+                text = f"[{self.equipment}:slot-{self.slot}:{self.labware}:{_WELL_IDS[self.well_id]}]"
+            else:
+                text = f"[{self.equipment}:slot-{self.slot}:{self.labware}]"
+            # Location is frozen, so the cache is set bypassing __setattr__
+            object.__setattr__(self, '_str', text)
+        return self._str
+
+@functools.lru_cache(maxsize=256)
+def make_location(equipment: Equipment, slot: int, labware: Labware, well_id: int) -> Location:
+    """
+    Return a Location, reusing the same instance for repeated arguments. 
+    Locations are immutable, so they can be shared freely.
+    """
+    return Location(equipment, slot, labware, well_id)
 
 # -------------------------------------------------------------------
 # Location id class
         
+@dataclass(slots=True, eq=False)
 class LocationId:
-    def __init__(self, id: str):
-        self.id = id
+    id: str
         
     def __str__(self):
         return f'id {self.id}'
@@ -131,9 +166,10 @@ class LabMaterial(Material):
         'Octane',
         'Dye',
     ]
+    _STANDARD_REAGENT_SET = frozenset(STANDARD_REAGENTS)
     
     def __init__(self, name: str):
-        if name not in self.STANDARD_REAGENTS:
+        if name not in self._STANDARD_REAGENT_SET:
             raise ValueError(f"'{name}' is not a standard reagent. "
                            f"Available reagents: {self.STANDARD_REAGENTS}")
         super().__init__(name)
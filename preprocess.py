@@ -2,16 +2,16 @@ import ast
 import json
 import sys
 
-types = set()
-funcs = []
-
 def get_full_attr(node):
-    if isinstance(node, ast.Attribute):
-        return get_full_attr(node.value) + "." + node.attr
-    elif isinstance(node, ast.Name):
-        return node.id
-    else:
-        return ""
+    # walk down the attribute chain collecting names, then join them once
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    # a base that is not a plain name (e.g. a call) contributes an empty leading part
+    parts.append(node.id if isinstance(node, ast.Name) else "")
+    parts.reverse()
+    return ".".join(parts)
     
 def get_func_name(node):
     if isinstance(node.func, ast.Name):
@@ -22,46 +22,76 @@ def get_func_name(node):
         func_name = ast.dump(node.func)
     return func_name
         
+def get_arg_value(arg):
+    # constants and plain names are by far the most common arguments, handle them directly
+    if isinstance(arg, ast.Constant):
+        return arg.value
+    if isinstance(arg, ast.Name):
+        return arg.id
+    try:
+        return ast.literal_eval(arg)
+    except Exception:
+        return ast.unparse(arg)  # fallback for complex expressions
+
 def get_args(node):
     arg_data = []
     # Positional arguments
     for arg in node.args:
-        try:
-            value = ast.literal_eval(arg)
-        except Exception:
-            value = ast.unparse(arg)  # fallback for complex expressions
-        arg_data.append(value)
+        arg_data.append(get_arg_value(arg))
 
     # Keyword arguments
     for kw in node.keywords:
         if kw.arg is not None:
-            try:
-                value = ast.literal_eval(kw.value)
-            except Exception:
-                value = ast.unparse(kw.value)
-            arg_data.append({kw.arg: value})
+            arg_data.append({kw.arg: get_arg_value(kw.value)})
         else:
             arg_data.append({"**kwargs_unpack": ast.unparse(kw.value)})
     return arg_data
         
-def ast_to_dict(node):
-    if isinstance(node, ast.AST):
-        node_type = node.__class__.__name__
-        result = {"_type": node_type}
-        types.add(node_type) # Collect type names
+def write_ast_json(tree, out):
+    """
+    Write the AST to out as JSON, formatted as json.dumps(..., indent=4) would.
+    The JSON is streamed as the tree is walked, instead of first converting the whole tree 
+    to dicts. Node types and function calls are collected on the way and returned.
+    """
+    types = set()
+    funcs = []
+    types_add = types.add
+    funcs_append = funcs.append
+    # one encoder reused for every scalar; the tree has no cycles to check for
+    dumps = json.JSONEncoder(check_circular=False).encode
 
-        if isinstance(node, ast.Call):
-            func_name = get_func_name(node)                
-            arg_data = get_args(node)
-            funcs.append([node.lineno, func_name, arg_data]) # Collect function calls
-            
-        for field, value in ast.iter_fields(node):
-            result[field] = ast_to_dict(value)
-        return result
-    elif isinstance(node, list):
-        return [ast_to_dict(item) for item in node]
-    else:
-        return node
+    def write_json(node, indent, AST=ast.AST, Call=ast.Call, iter_fields=ast.iter_fields, write=out.write):
+        if isinstance(node, AST):
+            node_type = node.__class__.__name__
+            types_add(node_type) # Collect type names
+
+            if isinstance(node, Call):
+                func_name = get_func_name(node)                
+                arg_data = get_args(node)
+                funcs_append((node.lineno, func_name, arg_data)) # Collect function calls
+                
+            inner = indent + "    "
+            write('{\n' + inner + '"_type": ' + dumps(node_type))
+            for field, value in iter_fields(node):
+                write(',\n' + inner + dumps(field) + ': ')
+                write_json(value, inner)
+            write('\n' + indent + '}')
+        elif isinstance(node, list):
+            if not node:
+                write('[]')
+                return
+            inner = indent + "    "
+            separator = '[\n' + inner
+            for item in node:
+                write(separator)
+                write_json(item, inner)
+                separator = ',\n' + inner
+            write('\n' + indent + ']')
+        else:
+            write(dumps(node))
+
+    write_json(tree, "")
+    return types, funcs
 
 # ---------------------------------------------------------------------
 # Main execution
@@ -75,21 +105,21 @@ for i in range(5):
     print(sum)
 """
 
+filename = "<inline>"
 if len(sys.argv) > 1:
-    with open(sys.argv[1], "r") as f:
+    filename = sys.argv[1]
+    with open(filename, "r") as f:
         code = f.read()
  
 # Parse into AST
-tree = ast.parse(code)
+tree = compile(code, filename, "exec", flags=ast.PyCF_ONLY_AST)
 
-# Convert AST to JSON
-tree_dict = ast_to_dict(tree)
-json_repr = json.dumps(tree_dict, indent=4)
+# Output AST as JSON
+types, funcs = write_ast_json(tree, sys.stdout)
+print()
 
 # Output results
-print(json_repr)
 print("Collected AST Node Types:", types)
 print("\nCollected Function Calls:\n")
 print("Line: Function Name                  Arguments")
-for f in funcs:
-    print(f'{f[0]:4d}: {f[1]:30s} {f[2]}')
+sys.stdout.writelines(f'{f[0]:4d}: {f[1]:30s} {f[2]}\n' for f in funcs)
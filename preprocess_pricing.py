@@ -1,10 +1,49 @@
 import ast
+import math
 import operator
+import sys
 from typing import Dict, List, Tuple, Any, Optional, Union
-from dataclasses import dataclass, field
-from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from collections import Counter, defaultdict
 
-@dataclass
+# binary operators the analyzer evaluates
+_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+# source text of binary operators, used to name arguments
+_BINOP_STR = {
+    ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.FloorDiv: '//', 
+    ast.Mod: '%', ast.Pow: '**', ast.LShift: '<<', ast.RShift: '>>', 
+    ast.BitOr: '|', ast.BitXor: '^', ast.BitAnd: '&', ast.MatMult: '@'
+}
+
+# source text of unary and comparison operators, used to name arguments
+_UNARYOP_STR = {ast.UAdd: '+', ast.USub: '-', ast.Invert: '~', ast.Not: 'not '}
+_CMPOP_STR = {
+    ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', 
+    ast.Is: 'is', ast.IsNot: 'is not', ast.In: 'in', ast.NotIn: 'not in'
+}
+
+# expressions named by _operator_name
+_OPERATOR_NODES = (ast.Slice, ast.UnaryOp, ast.Compare, ast.BoolOp, ast.IfExp, ast.Starred)
+
+def _is_atom(node):
+    """Check if a node is a name or a number/bool/None constant, whose name is the same as ast.unparse gives."""
+    if isinstance(node, ast.Name):
+        return True
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return value is None or type(value) in (int, bool) or (type(value) is float and math.isfinite(value))
+    return False
+
+@dataclass(slots=True)
 class CallInfo:
     """Information about a function call."""
     line: int
@@ -16,7 +55,7 @@ class CallInfo:
     iteration: Optional[Union[int, Tuple[int, ...], str]] = None
     execution_path: str = "both"
 
-@dataclass
+@dataclass(slots=True)
 class FunctionStats:
     """Statistics for a function's calls."""
     name: str
@@ -25,50 +64,128 @@ class FunctionStats:
     min_count: Union[int, str] = 0
     max_count: Union[int, str] = 0
 
+_MISSING = object()
+_VARIABLE = object()  # marks expressions whose value depends on tracked variables
+
 class VariableTracker:
-    """Tracks variable assignments and their values throughout the AST."""
+    """Tracks variable assignments and their values throughout the AST.
+    
+    All visible bindings are kept in one flat dict, so a lookup is a single dict access.
+    Each scope records the bindings it shadowed, which are restored when the scope is popped.
+    """
+    
+    __slots__ = ('flat', 'shadow_stack')
     
     def __init__(self):
-        self.scope_stack = [{}]
+        self.flat = {}
+        self.shadow_stack = [{}]
     
     def push_scope(self):
-        self.scope_stack.append({})
+        self.shadow_stack.append({})
     
     def pop_scope(self):
-        if len(self.scope_stack) > 1:
-            self.scope_stack.pop()
+        if len(self.shadow_stack) > 1:
+            flat = self.flat
+            for name, value in self.shadow_stack.pop().items():
+                if value is _MISSING:
+                    del flat[name]
+                else:
+                    flat[name] = value
     
     def assign(self, name, value):
-        self.scope_stack[-1][name] = value
+        # remember the binding this scope shadows, only the first time it is assigned here
+        shadowed = self.shadow_stack[-1]
+        if name not in shadowed:
+            shadowed[name] = self.flat.get(name, _MISSING)
+        self.flat[name] = value
     
     def get(self, name):
-        for scope in reversed(self.scope_stack):
-            if name in scope:
-                return scope[name]
-        return None
+        return self.flat.get(name)
     
     def copy(self):
         new_tracker = VariableTracker()
-        new_tracker.scope_stack = [scope.copy() for scope in self.scope_stack]
+        new_tracker.flat = self.flat.copy()
+        new_tracker.shadow_stack = [shadowed.copy() for shadowed in self.shadow_stack]
         return new_tracker
 
+class CallList:
+    """Append-only list of calls that shares the calls made before a path split.
+    
+    The calls made before a split are frozen in a parent segment used by both paths, 
+    so splitting does not copy them.
+    """
+    
+    __slots__ = ('parent', 'own', 'length')
+    
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.own = []
+        self.length = parent.length if parent is not None else 0
+    
+    def append(self, call_info):
+        self.own.append(call_info)
+        self.length += 1
+    
+    def __len__(self):
+        return self.length
+    
+    def __iter__(self):
+        segments = []
+        node = self
+        while node is not None:
+            segments.append(node.own)
+            node = node.parent
+        for segment in reversed(segments):
+            yield from segment
+    
+    def tail(self, start):
+        """Return the calls from index start on."""
+        calls = []
+        node = self
+        while node is not None and node.length > start:
+            segment_start = node.length - len(node.own)
+            calls[:0] = node.own[max(0, start - segment_start):]
+            node = node.parent
+        return calls
+    
+    def split(self):
+        """Freeze the calls made so far and return two lists continuing from them."""
+        frozen = self if self.own else self.parent
+        return CallList(frozen), CallList(frozen)
+
 class ExecutionPath:
     """Represents an execution path with its calls."""
     
+    __slots__ = ('calls', 'loop_stack', 'variable_tracker', 'func_counts')
+    
     def __init__(self):
-        self.calls = []
+        self.calls = CallList()
         self.loop_stack = []
         self.variable_tracker = VariableTracker()
+        self.func_counts = Counter()  # number of calls made to each function on this path
     
     def copy(self):
         new_path = ExecutionPath()
-        new_path.calls = self.calls.copy()
+        # both paths continue from the calls made so far, which are shared rather than copied
+        self.calls, new_path.calls = self.calls.split()
+        new_path.func_counts = self.func_counts.copy()
         new_path.loop_stack = self.loop_stack.copy()
         new_path.variable_tracker = self.variable_tracker.copy()
         return new_path
     
     def add_call(self, call_info):
         self.calls.append(call_info)
+        self.func_counts[call_info.func_name] += 1
+    
+    def state_key(self):
+        """Key of the state that decides how the path continues.
+        
+        Paths with equal keys make the same calls from here on, they differ only in the calls made so far.
+        """
+        tracker = self.variable_tracker
+        return repr((sorted(tracker.flat.items()), 
+                     [sorted(shadowed.items()) for shadowed in tracker.shadow_stack], 
+                     self.loop_stack))
     
     def enter_loop(self, iterations):
         self.loop_stack.append((iterations, None))
@@ -101,6 +218,29 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
         self.current_paths = [ExecutionPath()]  # List of current execution paths
         self.function_stats = defaultdict(lambda: FunctionStats(""))
         self.function_context_stack = []
+        self._argname_cache = {}  # argument node -> name
+        self._funcname_cache = {}  # func node of a call, or node in its attribute chain -> function name
+        self._call_templates = {}  # call node -> (argument names, per argument (value, info) or None)
+        self._const_cache = {}  # expression node -> its value, or _VARIABLE if it reads variables
+        self._keeps_state = {}  # for loop node -> whether its body leaves the paths unchanged
+        # node type -> handler, so dispatch does not build and look up a method name per node
+        self._handlers = {
+            ast.Assign: self.visit_Assign,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.For: self.visit_For,
+            ast.If: self.visit_If,
+            ast.Call: self.visit_Call,
+        }
+    
+    def visit(self, node):
+        """Visit a node using the handler table."""
+        return self._handlers.get(type(node), self.generic_visit)(node)
+    
+    def generic_visit(self, node):
+        """Visit all child nodes of a node without a dedicated handler."""
+        visit = self.visit
+        for child in ast.iter_child_nodes(node):
+            visit(child)
     
     def visit_Assign(self, node):
         """Handle variable assignments."""
@@ -147,6 +287,24 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
             
             for path in self.current_paths:
                 path.exit_loop()
+        elif self._body_keeps_state(node):
+            # Known iterations over a body that changes no state: every iteration makes the same 
+            # calls, so visit the body once and repeat its calls for the remaining iterations
+            depth = len(self.current_paths[0].loop_stack)
+            starts = [len(path.calls) for path in self.current_paths]
+            for path in self.current_paths:
+                path.enter_loop(iterations)
+                path.set_loop_iteration(0)
+            for stmt in node.body:
+                self.visit(stmt)
+            for path in self.current_paths:
+                path.exit_loop()
+            
+            for path, start in zip(self.current_paths, starts):
+                first_calls = path.calls.tail(start)
+                for i in range(1, iterations):
+                    for call in first_calls:
+                        path.add_call(replace(call, iteration=self._with_iteration(call.iteration, depth, i)))
         else:
             # Known iterations: unroll the loop
             loop_paths = self.current_paths
@@ -162,6 +320,22 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
                     path.exit_loop()
                 loop_paths = self.current_paths
     
+    def _body_keeps_state(self, node):
+        """Check if a loop body can neither assign variables nor split execution paths."""
+        keeps_state = self._keeps_state.get(node)
+        if keeps_state is None:
+            keeps_state = not any(isinstance(child, (ast.Assign, ast.If)) 
+                                  for stmt in node.body for child in ast.walk(stmt))
+            self._keeps_state[node] = keeps_state
+        return keeps_state
+    
+    @staticmethod
+    def _with_iteration(iteration, depth, i):
+        """Return a call's iteration with the loop at the given depth set to iteration i."""
+        if isinstance(iteration, tuple):
+            return iteration[:depth] + (i,) + iteration[depth + 1:]
+        return i
+    
     def visit_If(self, node):
         """Handle if statements by creating separate execution paths."""
         new_paths = []
@@ -193,7 +367,31 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
             new_paths.extend(if_result_paths)
             new_paths.extend(else_result_paths)
         
-        self.current_paths = new_paths
+        self.current_paths = self._prune_paths(new_paths)
+    
+    def _prune_paths(self, paths):
+        """Drop paths that can never be reported as a min or max path.
+        
+        Paths in the same state gain the same calls from here on, so among them only the first 
+        path with the fewest and the first with the most calls of each function can be picked by 
+        finalize_stats. Everything else is dropped, which keeps the number of paths from doubling 
+        on every if statement. The order of the remaining paths is preserved.
+        """
+        groups = {}
+        for path in paths:
+            groups.setdefault(path.state_key(), []).append(path)
+        if len(groups) == len(paths):
+            return paths
+        
+        keep = set()
+        for group in groups.values():
+            # the first path is the pick for functions none of the group has called yet
+            keep.add(id(group[0]))
+            for func_name in set().union(*(path.func_counts for path in group)):
+                counts = [path.func_counts[func_name] for path in group]
+                keep.add(id(group[counts.index(min(counts))]))
+                keep.add(id(group[counts.index(max(counts))]))
+        return [path for path in paths if id(path) in keep]
     
     def visit_Call(self, node):
         """Handle function calls."""
@@ -201,32 +399,21 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
         if func_name:
             parent_func = self.function_context_stack[-1] if self.function_context_stack else None
 
+            # argument names, and the info of arguments that evaluate the same on every path, are shared
+            arg_names, fixed_args = self._call_template(node)
+
             for path in self.current_paths:
                 # Analyze arguments
                 args = []
-                arg_names = []
                 arg_info = []
                 
-                for arg in node.args:
-                    arg_value = self._evaluate_expression(arg, path.variable_tracker)
-                    arg_name = self._get_argument_name(arg)
-                    
-                    args.append(arg_value)
-                    arg_names.append(arg_name)
-                    
-                    # Determine argument info
-                    info: Dict[str, Any] = {
-                        "name": arg_name,
-                        "type": type(arg_value).__name__ if arg_value is not None else "unknown"
-                    }
-                    if isinstance(arg_value, (list, tuple)):
-                        info["is_sequence"] = True
-                        info["length"] = len(arg_value)
-                        dims = self._get_list_dimensions(arg_value)
-                        if dims:
-                            info["dimensions"] = dims
+                for arg, arg_name, fixed in zip(node.args, arg_names, fixed_args):
+                    if fixed is None:
+                        arg_value = self._evaluate_expression(arg, path.variable_tracker)
+                        info = self._argument_info(arg_name, arg_value)
                     else:
-                        info["is_sequence"] = False
+                        arg_value, info = fixed
+                    args.append(arg_value)
                     arg_info.append(info)
                 
                 # Create call info
@@ -244,8 +431,52 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
         
         self.generic_visit(node)
     
+    def _call_template(self, node):
+        """Get the path independent argument data of a call, computed once per call node.
+        
+        Returns the argument names, and for each argument either its (value, info) if the argument 
+        reads no variable, or None if it has to be evaluated on each path.
+        """
+        template = self._call_templates.get(node)
+        if template is None:
+            arg_names = [self._get_argument_name(arg) for arg in node.args]
+            fixed_args = []
+            for arg, arg_name in zip(node.args, arg_names):
+                if any(isinstance(child, ast.Name) for child in ast.walk(arg)):
+                    fixed_args.append(None)
+                else:
+                    # no variable is read, so no tracker is needed
+                    arg_value = self._evaluate_expression(arg, None)
+                    fixed_args.append((arg_value, self._argument_info(arg_name, arg_value)))
+            template = self._call_templates[node] = (arg_names, fixed_args)
+        return template
+    
+    def _argument_info(self, arg_name, arg_value):
+        """Determine the info reported for an argument."""
+        info: Dict[str, Any] = {
+            "name": arg_name,
+            "type": type(arg_value).__name__ if arg_value is not None else "unknown"
+        }
+        if isinstance(arg_value, (list, tuple)):
+            info["is_sequence"] = True
+            info["length"] = len(arg_value)
+            dims = self._get_list_dimensions(arg_value)
+            if dims:
+                info["dimensions"] = dims
+        else:
+            info["is_sequence"] = False
+        return info
+    
     def _get_argument_name(self, arg_node):
         """Get the string representation/name of an argument."""
+        # the same argument is named again on every path and loop iteration, so names are cached per node
+        name = self._argname_cache.get(arg_node)
+        if name is None:
+            name = self._argname_cache[arg_node] = self._build_argument_name(arg_node)
+        return name
+    
+    def _build_argument_name(self, arg_node):
+        """Build the string representation/name of an argument."""
         if isinstance(arg_node, ast.Name):
             return arg_node.id
         elif isinstance(arg_node, ast.Constant):
@@ -263,13 +494,8 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
         elif isinstance(arg_node, ast.BinOp):
             left = self._get_argument_name(arg_node.left)
             right = self._get_argument_name(arg_node.right)
-            op_map = {
-                ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/', ast.FloorDiv: '//', 
-                ast.Mod: '%', ast.Pow: '**', ast.LShift: '<<', ast.RShift: '>>', 
-                ast.BitOr: '|', ast.BitXor: '^', ast.BitAnd: '&', ast.MatMult: '@'
-            }
             # Fallback for unknown operators
-            op_str = op_map.get(type(arg_node.op), f'<{type(arg_node.op).__name__}>')
+            op_str = _BINOP_STR.get(type(arg_node.op)) or f'<{type(arg_node.op).__name__}>'
             return f"({left} {op_str} {right})"
         elif isinstance(arg_node, ast.Call):
             func_name = self._get_function_name(arg_node)
@@ -285,12 +511,58 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
             # In Python 3.9+, ast.Index is deprecated and the slice is the value directly.
             slice_name = self._get_argument_name(arg_node.slice)
             return f"{value_name}[{slice_name}]"
+        elif isinstance(arg_node, _OPERATOR_NODES):
+            return self._operator_name(arg_node)
         else:
             try:
                 return ast.unparse(arg_node)
             except AttributeError:
                 return "<complex_expression>"
 
+    def _operator_name(self, node):
+        """Get the name of a unary, comparison, boolean, conditional, starred or slice expression.
+        
+        Names are built directly when all operands are atoms, which never need parentheses, 
+        so they match ast.unparse. Nested expressions use ast.unparse, which adds parentheses by precedence.
+        """
+        if isinstance(node, ast.Slice):
+            operands = [operand for operand in (node.lower, node.upper, node.step) if operand is not None]
+        elif isinstance(node, ast.UnaryOp):
+            operands = [node.operand]
+        elif isinstance(node, ast.Compare):
+            operands = [node.left, *node.comparators]
+        elif isinstance(node, ast.BoolOp):
+            operands = node.values
+        elif isinstance(node, ast.IfExp):
+            operands = [node.body, node.test, node.orelse]
+        else:
+            operands = [node.value]
+        if not all(_is_atom(operand) for operand in operands):
+            return ast.unparse(node)
+        
+        name = self._get_argument_name
+        if isinstance(node, ast.Slice):
+            lower = name(node.lower) if node.lower else ""
+            upper = name(node.upper) if node.upper else ""
+            if node.step:
+                return f"{lower}:{upper}:{name(node.step)}"
+            return f"{lower}:{upper}"
+        elif isinstance(node, ast.UnaryOp):
+            return f"{_UNARYOP_STR[type(node.op)]}{name(node.operand)}"
+        elif isinstance(node, ast.Compare):
+            parts = [name(node.left)]
+            for op, comparator in zip(node.ops, node.comparators):
+                parts.append(_CMPOP_STR[type(op)])
+                parts.append(name(comparator))
+            return " ".join(parts)
+        elif isinstance(node, ast.BoolOp):
+            separator = " and " if isinstance(node.op, ast.And) else " or "
+            return separator.join(name(value) for value in node.values)
+        elif isinstance(node, ast.IfExp):
+            return f"{name(node.body)} if {name(node.test)} else {name(node.orelse)}"
+        else:
+            return f"*{name(node.value)}"
+
     def _get_list_dimensions(self, item: Any) -> Tuple[int, ...]:
         """Recursively determine the dimensions of a nested list/tuple."""
         if not isinstance(item, (list, tuple)):
@@ -310,13 +582,23 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
 
     def _get_function_name(self, call_node):
         """Extract function name from call node."""
-        node = call_node.func
-        if isinstance(node, ast.Name):
-            return node.id
-        if isinstance(node, ast.Attribute):
-            # Recursively build the full attribute chain
-            return f"{self._get_function_name(ast.Call(func=node.value, args=[], keywords=[]))}.{node.attr}"
-        return self._get_argument_name(node)
+        return self._name_of(call_node.func)
+    
+    def _name_of(self, node):
+        """Get the function name for the func node of a call, or any node in its attribute chain."""
+        name = self._funcname_cache.get(node)
+        if name is None:
+            if isinstance(node, ast.Name):
+                name = node.id
+            elif isinstance(node, ast.Attribute):
+                # Recursively build the full attribute chain
+                name = f"{self._name_of(node.value)}.{node.attr}"
+            else:
+                name = self._get_argument_name(node)
+            # calls of the same function from different places then share one name object, 
+            # so the per-function counters compare names by identity
+            name = self._funcname_cache[node] = sys.intern(name)
+        return name
 
     def _calculate_iterations(self, iter_node, variable_tracker):
         """Calculate the number of iterations for a given iterable."""
@@ -351,16 +633,14 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
     
     def _handle_range_call(self, call_node, variable_tracker):
         """Handle range() function calls."""
-        args = [self._evaluate_expression(arg, variable_tracker) for arg in call_node.args]
-        
-        if None in args:
-            return "unknown"
-        
-        if any([not isinstance(a, int) for a in args]):
-            return "unknown"
-        
-        # cast all elements of args to int
-        args = [int(a) if isinstance(a, int) else 0 for a in args]
+        args = []
+        for arg in call_node.args:
+            value = self._evaluate_expression(arg, variable_tracker)
+            # stop at the first argument that is not an int (or unknown), the rest need not be evaluated
+            if not isinstance(value, int):
+                return "unknown"
+            # cast to int, so that bools count as 0/1
+            args.append(int(value))
         
         try:
             if len(args) == 1:
@@ -397,26 +677,35 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
             return node.value
         elif isinstance(node, ast.Name):
             return variable_tracker.get(node.id)
-        elif isinstance(node, ast.List):
-            elements = []
-            for elt in node.elts:
-                val = self._evaluate_expression(elt, variable_tracker)
-                if val is None:
-                    return None
-                elements.append(val)
-            return elements
-        elif isinstance(node, ast.Tuple):
-            elements = []
-            for elt in node.elts:
-                val = self._evaluate_expression(elt, variable_tracker)
-                if val is None:
-                    return None
-                elements.append(val)
-            return tuple(elements)
+        
+        # expressions that read no variable have the same value on every path, so they are evaluated once
+        value = self._const_cache.get(node, _MISSING)
+        if value is not _VARIABLE and value is not _MISSING:
+            return value
+        
+        if isinstance(node, (ast.List, ast.Tuple)):
+            value = self._evaluate_elements(node.elts, variable_tracker)
+            if value is not None and isinstance(node, ast.Tuple):
+                value = tuple(value)
         elif isinstance(node, ast.BinOp):
-            return self._evaluate_binop(node, variable_tracker)
+            value = self._evaluate_binop(node, variable_tracker)
+        else:
+            return None
         
-        return None
+        if node not in self._const_cache:
+            reads_variables = any(isinstance(child, ast.Name) for child in ast.walk(node))
+            self._const_cache[node] = _VARIABLE if reads_variables else value
+        return value
+    
+    def _evaluate_elements(self, elts, variable_tracker):
+        """Evaluate the elements of a list or tuple, None if any of them is unknown."""
+        elements = []
+        for elt in elts:
+            val = self._evaluate_expression(elt, variable_tracker)
+            if val is None:
+                return None
+            elements.append(val)
+        return elements
     
     def _evaluate_binop(self, node, variable_tracker):
         """Evaluate binary operations."""
@@ -426,19 +715,10 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
         if left is None or right is None:
             return None
         
-        ops = {
-            ast.Add: operator.add,
-            ast.Sub: operator.sub,
-            ast.Mult: operator.mul,
-            ast.Div: operator.truediv,
-            ast.FloorDiv: operator.floordiv,
-            ast.Mod: operator.mod,
-            ast.Pow: operator.pow,
-        }
-        
-        if type(node.op) in ops:
+        op = _BINOPS.get(type(node.op))
+        if op is not None:
             try:
-                return ops[type(node.op)](left, right)
+                return op(left, right)
             except Exception:
                 return None
         
@@ -449,48 +729,42 @@ class ComprehensiveASTAnalyzer(ast.NodeVisitor):
         if not self.current_paths:
             return
         
-        all_func_names = set(call.func_name for path in self.current_paths for call in path.calls)
+        all_func_names = list(set().union(*(path.func_counts for path in self.current_paths)))
 
-        # Find min and max call counts per function
-        function_call_counts = defaultdict(list)
+        # Find min and max call counts per function, paths count their calls as they are added
+        # (count, path) pairs are collected in a list per function, indexed like all_func_names
+        function_call_counts = [[] for _ in all_func_names]
         for path in self.current_paths:
-            path_counts = defaultdict(int)
-            for call in path.calls:
-                path_counts[call.func_name] += 1
-
-            for func_name in all_func_names:
-                function_call_counts[func_name].append((path_counts[func_name], path))
+            path_counts = path.func_counts
+            for func_name, count_path_pairs in zip(all_func_names, function_call_counts):
+                count_path_pairs.append((path_counts[func_name], path))
         
         # For each function, find the paths with min and max calls
-        for func_name, count_path_pairs in function_call_counts.items():
+        for func_name, count_path_pairs in zip(all_func_names, function_call_counts):
             if not count_path_pairs:
                 continue
                 
-            # Sort by call count
-            count_path_pairs.sort(key=lambda x: x[0])
-            
-            min_count = count_path_pairs[0][0]
-            max_count = count_path_pairs[-1][0]
-            
-            # Get all paths with minimum calls
-            min_paths = [path for count, path in count_path_pairs if count == min_count]
-            # Get all paths with maximum calls  
-            max_paths = [path for count, path in count_path_pairs if count == max_count]
+            # Find the first path with minimum calls and the first with maximum calls in one pass
+            min_count, min_path = count_path_pairs[0]
+            max_count, max_path = count_path_pairs[0]
+            for count, path in count_path_pairs:
+                if count < min_count:
+                    min_count, min_path = count, path
+                elif count > max_count:
+                    max_count, max_path = count, path
             
             # Create function stats
             stats = FunctionStats(func_name)
             
             # Add calls from one representative min path
-            if min_paths:
-                for call in min_paths[0].calls:
-                    if call.func_name == func_name:
-                        stats.min_calls.append(call)
+            for call in min_path.calls:
+                if call.func_name == func_name:
+                    stats.min_calls.append(call)
             
             # Add calls from one representative max path
-            if max_paths:
-                for call in max_paths[0].calls:
-                    if call.func_name == func_name:
-                        stats.max_calls.append(call)
+            for call in max_path.calls:
+                if call.func_name == func_name:
+                    stats.max_calls.append(call)
             
             # Set counts
             if any(call.iteration == "unknown" for call in stats.min_calls):
@@ -626,7 +900,6 @@ print("Done", data)
 
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) > 1:
         with open(sys.argv[1], "r") as f:
             code = f.read()    
@@ -1,4 +1,5 @@
 from oss_utils import LocationId, logger
+import logging
 import oss_lib
 #import oss_lib_stub as oss_lib
 import time
@@ -27,20 +28,22 @@ class ResearcherLib:
         Raises:
             Exception: If the target location does not exist
         """
-        logger.info(f"Researcher: Experiment {exp_id}: Wash {[str(id) for id in target_id]}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Researcher: Experiment %s: Wash %s", exp_id, [str(id) for id in target_id])
         
+        if mix_volume is None:
+            mix_volume = wash_volume
+
         for cycle in range(wash_cycles):
-            for id in target_id:
-                # Step 1: Dispense wash buffer
-                self._oss.transfer(exp_id, wash_volume, wash_buffer,  id)
+            # Step 1: Dispense wash buffer to all targets in one batched transfer
+            self._oss.transfer(exp_id, wash_volume, wash_buffer, target_id)
 
-                # Step 2: Optional soak
-                if soak_time:
-                    time.sleep(soak_time)
+            # Step 2: Optional soak, all targets soak together
+            if soak_time:
+                time.sleep(soak_time)
 
+            for id in target_id:
                 # Step 3: Mix in well
-                if mix_volume is None:
-                    mix_volume = wash_volume
                 self._oss.mix(exp_id, id, mix_volume, mix_cycles)
 
                 # Step 4: Discard to waste
@@ -0,0 +1,62 @@
+import ast
+import unittest
+
+from preprocess_pricing import ComprehensiveASTAnalyzer
+
+
+def parse_arg(source: str) -> ast.AST:
+    """Parse source as the only positional argument of a call and return its node."""
+    return ast.parse(f"f({source})", mode="eval").body.args[0]
+
+
+class TestArgumentNames(unittest.TestCase):
+    """Argument names built without ast.unparse must read the same as ast.unparse."""
+
+    def assert_names_match_unparse(self, sources):
+        analyzer = ComprehensiveASTAnalyzer()
+        for source in sources:
+            with self.subTest(source=source):
+                node = parse_arg(source)
+                self.assertEqual(analyzer._get_argument_name(node), ast.unparse(node))
+
+    def test_unary_op(self):
+        self.assert_names_match_unparse([
+            "-x", "+x", "~x", "not x", "-1", "not None",
+            "not (a and b)", "-(x if y else z)", "-x ** 2", "-(-x)", "not not x",
+            "-(a < b)", "not a == b", "~(a | b)",
+        ])
+
+    def test_compare(self):
+        self.assert_names_match_unparse([
+            "a < b", "a < b <= 1", "a is not None", "a not in b",
+            "(a or b) == c", "(a == b) == c", "a == (b == c)", "a < -b",
+            "(not a) == b", "(x if y else z) < 1", "a in [1, 2]", "a == 's'",
+        ])
+
+    def test_bool_op(self):
+        self.assert_names_match_unparse([
+            "a and b", "a or b or c",
+            "a and (b or c)", "(a and b) or c", "(a or b) and c", "not a and b",
+            "a and b == c", "(x if y else z) and a", "a or -b",
+        ])
+
+    def test_if_exp(self):
+        self.assert_names_match_unparse([
+            "x if y else z",
+            "(x if y else z) if a else b", "x if (y if a else b) else z", "x if y else (z if a else b)",
+            "a or b if c and d else e", "(lambda: x) if y else z", "-x if y else z",
+        ])
+
+    def test_slice(self):
+        self.assert_names_match_unparse([
+            "xs[1:2]", "xs[::2]", "xs[:]", "xs[a:]", "xs[1:2:3]",
+            "cells[i * num_cols:(i + 1) * num_cols]", "xs[-1:]", "xs[a if b else c:]",
+            "xs[(a, b):]",
+        ])
+
+    def test_starred(self):
+        self.assert_names_match_unparse(["*xs", "*(a or b)", "*(xs + ys)", "*f(x)"])
+
+
+if __name__ == "__main__":
+    unittest.main()